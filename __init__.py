@@ -1 +1,20 @@
+# -*- coding: utf-8 -*-
 from . import models
+
+
+def post_init_hook(env):
+    """Crea el índice que usa la consulta de saldos de _compute_journal_balances.
+
+    La consulta filtra por account_id, company_id, parent_state='posted' y
+    date<=hoy; sin un índice compuesto PG resuelve por account_id y filtra el
+    resto fila a fila. El predicado parcial sobre parent_state calca el de la
+    consulta y el INCLUDE (balance) habilita index-only scans del agregado.
+    """
+    env.cr.execute(
+        """
+        CREATE INDEX IF NOT EXISTS account_move_line_posted_balance_idx
+            ON account_move_line (account_id, company_id, date)
+       INCLUDE (balance)
+         WHERE parent_state = 'posted'
+        """
+    )
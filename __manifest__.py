@@ -12,6 +12,7 @@
         "views/transfer_central_views.xml",
         "views/menu.xml"
     ],
+    "post_init_hook": "post_init_hook",
     "application": False,
     "installable": True
 }
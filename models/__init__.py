@@ -1,2 +1,3 @@
+from . import account_journal
 from . import res_company
 from . import transfer_central
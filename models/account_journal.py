@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Cuenta principal materializada del diario, usada por transfer.central para
+# resolver el asiento y para que la consulta de saldos pueda hacer JOIN directo.
+from odoo import api, fields, models, tools
+
+# Campos candidatos a cuenta principal, en orden de prioridad (v17: los
+# payment_* pueden no existir según los módulos instalados).
+MAIN_ACCOUNT_FIELDS = (
+    "default_account_id",
+    "payment_debit_account_id",
+    "payment_credit_account_id",
+)
+
+
+class AccountJournal(models.Model):
+    _inherit = "account.journal"
+
+    main_account_id = fields.Many2one(
+        "account.account",
+        string="Cuenta principal (transferencias)",
+        compute="_compute_main_account_id",
+        store=True,
+        index=True,
+        help="Primera cuenta configurada entre default/payment_*; materializada "
+             "para evitar la resolución por prioridad en cada uso.",
+    )
+
+    @api.model
+    @tools.ormcache()
+    def _journal_account_field_names(self):
+        """Campos candidatos a cuenta principal realmente presentes en esta base,
+        en orden de prioridad. La pertenencia a _fields es estática por registry,
+        así que se prueba una sola vez en lugar de en cada resolución.
+        """
+        return tuple(f for f in MAIN_ACCOUNT_FIELDS if f in self._fields)
+
+    # Solo default_account_id existe garantizado en v17; si otros módulos
+    # aportan los campos payment_*, el override de write refresca el cómputo.
+    @api.depends("default_account_id")
+    def _compute_main_account_id(self):
+        field_names = self._journal_account_field_names()
+        for journal in self:
+            journal.main_account_id = next(
+                (journal[fname] for fname in field_names if journal[fname]),
+                False,
+            )
+
+    def write(self, vals):
+        res = super().write(vals)
+        extra_fields = set(MAIN_ACCOUNT_FIELDS) - {"default_account_id"}
+        if any(f in vals for f in extra_fields):
+            self._compute_main_account_id()
+        return res
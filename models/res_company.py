@@ -10,7 +10,7 @@ class ResCompany(models.Model):
     central_cash_journal_id = fields.Many2one(
         "account.journal",
         string="Diario Efectivo Central",
-        domain="[('type','in',('cash','bank')), ('company_id','=', id)]",
+        domain="[('type','in',('cash','bank')), ('company_id','in',[id])]",
         help="Diario de banco/caja de Casa Central donde se postean las transferencias."
     )
 
@@ -18,6 +18,6 @@ class ResCompany(models.Model):
     central_transit_account_id = fields.Many2one(
         "account.account",
         string="Cuenta Transitoria Central",
-        domain="[('deprecated','=',False), ('company_id','=', id)]",
+        domain="[('deprecated','=',False), ('company_id','in',[id])]",
         help="Cuenta de tránsito para recibir el débito del asiento de transferencia."
     )
\ No newline at end of file
